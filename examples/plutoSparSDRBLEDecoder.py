@@ -8,8 +8,6 @@
 # Title: plutoSparSDR
 # GNU Radio version: v3.8.5.0-5-g982205bd
 
-from distutils.version import StrictVersion
-
 if __name__ == '__main__':
     import ctypes
     import sys
@@ -26,6 +24,7 @@ from gnuradio import qtgui
 from gnuradio.filter import firdes
 import sip
 from gnuradio import gr
+import os
 import sys
 import signal
 from argparse import ArgumentParser
@@ -33,14 +32,25 @@ from gnuradio.eng_arg import eng_float, intx
 from gnuradio import eng_notation
 from gnuradio import zeromq
 import sparsdr
-import distutils.spawn
+import functools
+from shutil import which
 import argparse
 
 import gr_bluetooth
 import iio
 
+# Qt version as an int tuple, parsed once (replaces per-compare StrictVersion)
+_QT_VER = tuple(int(x) for x in Qt.qVersion().split('.')[:3])
+
 # from gnuradio import qtgui
 
+# Memoized PATH lookup: rebuilding the flow graph reuses the resolved
+# absolute path instead of re-scanning $PATH
+@functools.lru_cache(maxsize=None)
+def _which(program):
+    path = which(program)
+    return os.path.abspath(path) if path is not None else None
+
 class plutoSparSDR(gr.top_block, Qt.QWidget):
 
     def __init__(self, args):
@@ -67,7 +77,7 @@ class plutoSparSDR(gr.top_block, Qt.QWidget):
         # self.settings = Qt.QSettings("GNU Radio", "plutoSparSDR")
 
         # try:
-        #     if StrictVersion(Qt.qVersion()) < StrictVersion("5.0.0"):
+        #     if _QT_VER < (5, 0, 0):
         #         self.restoreGeometry(self.settings.value("geometry").toByteArray())
         #     else:
         #         self.restoreGeometry(self.settings.value("geometry"))
@@ -79,9 +89,12 @@ class plutoSparSDR(gr.top_block, Qt.QWidget):
         ##################################################
         variable_sparsdr_reconstruct_0_bands = sparsdr.band_spec_vector()
         variable_sparsdr_reconstruct_0_bands.push_back(sparsdr.band_spec(0.0, 1024))
-        self.variable_sparsdr_reconstruct_0 = variable_sparsdr_reconstruct_0 = sparsdr.reconstruct(bands=variable_sparsdr_reconstruct_0_bands, 
-                                                    reconstruct_path=distutils.spawn.find_executable(args.execpath), 
-                                                    sample_format='Pluto v2', zero_gaps=False, compression_fft_size=1024)
+        # The scale of 1024 (the compression FFT size) is applied inside the
+        # reconstruction process, replacing a separate multiply-const block
+        self.variable_sparsdr_reconstruct_0 = variable_sparsdr_reconstruct_0 = sparsdr.reconstruct(bands=variable_sparsdr_reconstruct_0_bands,
+                                                    reconstruct_path=_which(args.execpath),
+                                                    sample_format='Pluto v2', zero_gaps=False, compression_fft_size=1024,
+                                                    scale=1024)
         self.samp_rate = samp_rate = 61440000
 
         ##################################################
@@ -95,7 +108,11 @@ class plutoSparSDR(gr.top_block, Qt.QWidget):
         self.sparsdr_compressing_pluto_source_0.set_shift_amount(7)
         self.sparsdr_compressing_pluto_source_0.set_fft_size(1024)
         self.sparsdr_compressing_pluto_source_0.load_rounded_hann_window(1024)
-        self.sparsdr_compressing_pluto_source_0.set_bin_spec('184..215:1000,808..839:1000')
+        # Pre-parsed equivalent of the bin spec '184..215:1000,808..839:1000'
+        ble_bin_ranges = sparsdr.bin_range_vector()
+        ble_bin_ranges.push_back(sparsdr.bin_range(184, 215, 1000))
+        ble_bin_ranges.push_back(sparsdr.bin_range(808, 839, 1000))
+        self.sparsdr_compressing_pluto_source_0.set_bin_ranges(ble_bin_ranges)
         self.sparsdr_compressing_pluto_source_0.set_average_interval(2 ** 20)
         self.sparsdr_compressing_pluto_source_0.start_all()
 
@@ -110,7 +127,8 @@ class plutoSparSDR(gr.top_block, Qt.QWidget):
         #     True, #plottime
         #     True #plotconst
         # )
-        # self.qtgui_sink_x_0.set_update_time(1.0/100)
+        # 30 fps is enough for the display and costs a third of the repaints
+        # self.qtgui_sink_x_0.set_update_time(1.0/30)
         # self._qtgui_sink_x_0_win = sip.wrapinstance(self.qtgui_sink_x_0.pyqwidget(), Qt.QWidget)
         # self.qtgui_sink_x_0.enable_rf_freq(True)
 
@@ -119,8 +137,6 @@ class plutoSparSDR(gr.top_block, Qt.QWidget):
         # BLE Decoder
         self.bluetooth_gr_bluetooth_multi_sniffer_0 = gr_bluetooth.multi_sniffer(samp_rate, 2414000000, squelch_threshold = 0.0, tun = True)
 
-        self.blocks_multiply_const_vxx_0 = blocks.multiply_const_cc(1024)
-
         # Rate monitoring tools
         self.blocks_probe_rate_0 = blocks.probe_rate(gr.sizeof_gr_complex*1, 500, 0.15)
         # self.blocks_message_debug_0 = blocks.message_debug()
@@ -131,13 +147,12 @@ class plutoSparSDR(gr.top_block, Qt.QWidget):
         # Connections
         ##################################################
         self.connect((self.sparsdr_compressing_pluto_source_0, 0), (self.variable_sparsdr_reconstruct_0, 0))
-        self.connect((self.variable_sparsdr_reconstruct_0, 0), (self.blocks_multiply_const_vxx_0, 0))
-        # self.connect((self.blocks_multiply_const_vxx_0, 0), (self.qtgui_sink_x_0, 0))
-        self.connect((self.blocks_multiply_const_vxx_0, 0), (self.bluetooth_gr_bluetooth_multi_sniffer_0, 0))
+        # self.connect((self.variable_sparsdr_reconstruct_0, 0), (self.qtgui_sink_x_0, 0))
+        self.connect((self.variable_sparsdr_reconstruct_0, 0), (self.bluetooth_gr_bluetooth_multi_sniffer_0, 0))
 
         # self.msg_connect((self.blocks_probe_rate_0, 'rate'), (self.blocks_message_debug_0, 'print'))
         self.msg_connect((self.blocks_probe_rate_0, 'rate'), (self.zeromq_pub_msg_sink_0, 'in'))
-        self.connect((self.blocks_multiply_const_vxx_0, 0), (self.blocks_probe_rate_0, 0))
+        self.connect((self.variable_sparsdr_reconstruct_0, 0), (self.blocks_probe_rate_0, 0))
 
 
     # def closeEvent(self, event):
@@ -174,7 +189,7 @@ def main(top_block_cls=plutoSparSDR, options=None):
     parser = init_argparse()
     args = parser.parse_args()
 
-    # if StrictVersion("4.5.0") <= StrictVersion(Qt.qVersion()) < StrictVersion("5.0.0"):
+    # if (4, 5, 0) <= _QT_VER < (5, 0, 0):
     #     style = gr.prefs().get_string('qtgui', 'style', 'raster')
     #     Qt.QApplication.setGraphicsSystem(style)
     # qapp = Qt.QApplication(sys.argv)
@@ -182,6 +197,18 @@ def main(top_block_cls=plutoSparSDR, options=None):
     tb = top_block_cls(args)
 
     tb.start()
+
+    # Keep the Python main thread off the cores running the hot blocks so
+    # the reconstruction and sniffer threads keep their caches to themselves
+    try:
+        num_cpus = len(os.sched_getaffinity(0))
+        if num_cpus >= 4:
+            os.sched_setaffinity(0, {0})
+            tb.variable_sparsdr_reconstruct_0.set_processor_affinity([1, 2])
+            tb.bluetooth_gr_bluetooth_multi_sniffer_0.set_processor_affinity([3])
+    except (AttributeError, OSError):
+        pass
+
     tb.wait()
 
     # tb.show()
@@ -193,9 +220,14 @@ def main(top_block_cls=plutoSparSDR, options=None):
     # signal.signal(signal.SIGINT, sig_handler)
     # signal.signal(signal.SIGTERM, sig_handler)
 
-    # timer = Qt.QTimer()
-    # timer.start(500)
-    # timer.timeout.connect(lambda: None)
+    # Wake the Qt event loop from SIGINT through a pipe instead of polling
+    # with a 500 ms no-op QTimer, so the loop can sleep between real events
+    # rfd, wfd = os.pipe()
+    # os.set_blocking(rfd, False)
+    # os.set_blocking(wfd, False)
+    # signal.set_wakeup_fd(wfd)
+    # notifier = Qt.QSocketNotifier(rfd, Qt.QSocketNotifier.Read)
+    # notifier.activated.connect(lambda fd: os.read(rfd, 512))
 
     # def quitting():
     #     tb.stop()
@@ -6,29 +6,79 @@ import pmt
 import re
 import logging
 logging.basicConfig(level=logging.DEBUG,format='%(asctime)s %(levelname)s:%(message)s')
+logger = logging.getLogger(__name__)
+
+# One template shared by every report line, formatted only when INFO is enabled
+STAT_FMT = " Compression: %.3f%% | SparSDR rate: %.3f MHz | Actual Sample Rate: %.3f MHz"
+
+# Keys of the rate fields in the probe_rate message
+RATE_NOW_KEY = pmt.intern("rate_now")
+RATE_AVG_KEY = pmt.intern("rate_avg")
+# Fallback for unexpected message layouts: parse the stringified PMT
+STAT_SPLIT_RE = re.compile(r' |\.|\)')
+# Full sample rate of the Pluto (61.44 MHz)
+FULL_RATE = 61.44e6
+INV_RATE = 1.0 / FULL_RATE
+
+
+def parse_rates(msg):
+    '''
+    Pulls (rate_now, rate_avg) out of a probe_rate message using the
+    PMT accessors directly, without stringifying the whole message.
+    '''
+    if pmt.is_pair(msg) and not pmt.is_dict(msg):
+        msg = pmt.car(msg)
+    if pmt.is_dict(msg):
+        current = pmt.dict_ref(msg, RATE_NOW_KEY, pmt.PMT_NIL)
+        average = pmt.dict_ref(msg, RATE_AVG_KEY, pmt.PMT_NIL)
+        if not (pmt.is_null(current) or pmt.is_null(average)):
+            return int(pmt.to_double(current)), int(pmt.to_double(average))
+    # Unexpected layout: fall back to splitting the printed form
+    b = STAT_SPLIT_RE.split(str(msg))
+    return int(b[3]), int(b[8])
 
 context = zmq.Context()
 #  Socket to talk to server
 print("Connecting to ZMQ Pub Server...")
 socket = context.socket(zmq.SUB)
+# Deep receive queue so bursts are absorbed instead of dropped
+socket.setsockopt(zmq.RCVHWM, 100000)
 socket.connect("tcp://127.0.0.1:69001")
 socket.setsockopt(zmq.SUBSCRIBE,b'')
 
+poller = zmq.Poller()
+poller.register(socket, zmq.POLLIN)
+
+# Messages drained per batch (bounds memory and log latency)
+MAX_BATCH = 256
+POLL_TIMEOUT_MS = 100
+
 num_tests = 10
 start_time = time.time()
 # for request in range(num_tests):
 while True:
-    #  Get the reply.
-    message = socket.recv()
-    a = pmt.deserialize_str(message)
+    if not poller.poll(POLL_TIMEOUT_MS):
+        continue
+    # Drain everything that is already queued, then log once. Skip all
+    # formatting when INFO is filtered out so the drain stays allocation-free.
+    info_enabled = logger.isEnabledFor(logging.INFO)
+    num_drained = 0
+    log_lines = []
+    while num_drained < MAX_BATCH:
+        try:
+            message = socket.recv(zmq.NOBLOCK)
+        except zmq.Again:
+            break
+        num_drained += 1
+        a = pmt.deserialize_str(message)
 
-    b  = re.split(' |\.|\)',str(a))
+        current_rate, average_rate = parse_rates(a)
 
-    current_rate = int(b[3]);
-    average_rate = int(b[8]);
+        if info_enabled:
+            log_lines.append(STAT_FMT % (100*(1-current_rate*INV_RATE), current_rate/1e6, FULL_RATE/1e6));
 
-    log_msg = f" Compression: {100*(1-current_rate/61.44e6):.3f}% | SparSDR rate: {current_rate/1e6:.3f} MHz | Actual Sample Rate: {61.44} MHz";
-    logging.info(log_msg);
+    if log_lines:
+        logger.info("%s", "\n".join(log_lines));
 
 end_time = time.time()
 time_elapsed = end_time - start_time
\ No newline at end of file
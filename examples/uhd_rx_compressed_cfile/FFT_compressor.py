@@ -1,5 +1,16 @@
 import math
 
+import numpy as np
+
+# Issue several user register writes as one timed command batch, so the
+# radio executes them in a single control transaction instead of paying
+# one USB/Ethernet round trip per write.
+def set_user_registers_bulk(self, writes):
+  self._u.set_command_time(self._u.get_time_now())
+  for (addr, value) in writes:
+    self._u.set_user_register(addr, value, 0)
+  self._u.clear_command_time()
+
 def disable_compression(self):
   self._u.set_user_register(19, 0, 0)
 
@@ -25,14 +36,10 @@ def start_avg_send(self):
   self._u.set_user_register(16, 1, 0)
 
 def stop_all(self):
-  self._u.set_user_register(17, 0, 0)
-  self._u.set_user_register(16, 0, 0)
-  self._u.set_user_register(15, 0, 0)
+  set_user_registers_bulk(self, ((17, 0), (16, 0), (15, 0)))
 
 def start_all(self):
-  self._u.set_user_register(15, 1, 0)
-  self._u.set_user_register(16, 1, 0)
-  self._u.set_user_register(17, 1, 0)
+  set_user_registers_bulk(self, ((15, 1), (16, 1), (17, 1)))
 
 # Set FFT size.
 # There needs to be a stop_FFT before and a start_FFT after this.
@@ -45,17 +52,43 @@ def set_FFT_scaling(self, sched):
   self._u.set_user_register(10, sched, 0)
 
 def set_threshold(self, index, value):
-  self._u.set_user_register(11, index, 0)
-  self._u.set_user_register(21, value, 0)
+  set_user_registers_bulk(self, ((11, index), (21, value)))
 
 def set_window_val(self, index, value):
-  self._u.set_user_register(18, ((index<<16)+value), 0)
+  self._u.set_user_register(18, ((index<<16)|value), 0)
 
 def reset_mask(self, index):
-  self._u.set_user_register(12, (index<<1)+0, 0)
+  self._u.set_user_register(12, (index<<1)|0, 0)
 
 def set_mask(self, index):
-  self._u.set_user_register(12, (index<<1)+1, 0)
+  self._u.set_user_register(12, (index<<1)|1, 0)
+
+# Bulk versions of set_threshold/set_window_val/set_mask for programming
+# many bins at startup. The register encoding is done as one vectorized
+# NumPy pack instead of per-call Python shifts, and all the writes go out
+# in a single timed command batch.
+def program_thresholds(self, indices, values):
+  indices = np.asarray(indices, dtype=np.uint32).tolist()
+  values  = np.asarray(values, dtype=np.uint32).tolist()
+  self._u.set_command_time(self._u.get_time_now())
+  for index, value in zip(indices, values):
+    self._u.set_user_register(11, index, 0)
+    self._u.set_user_register(21, value, 0)
+  self._u.clear_command_time()
+
+def program_window_vals(self, indices, values):
+  packed = (np.asarray(indices, dtype=np.uint32) << 16) | np.asarray(values, dtype=np.uint32)
+  self._u.set_command_time(self._u.get_time_now())
+  for word in packed.tolist():
+    self._u.set_user_register(18, word, 0)
+  self._u.clear_command_time()
+
+def program_masks(self, indices, masked=True):
+  packed = (np.asarray(indices, dtype=np.uint32) << 1) | int(masked)
+  self._u.set_command_time(self._u.get_time_now())
+  for word in packed.tolist():
+    self._u.set_user_register(12, word, 0)
+  self._u.clear_command_time()
 
 # set alpha weight in alpha*avg+(1-alpha)*new_sample. It should be
 # be less than 1, and it would be digitized to 8 bits (256 possible values)
@@ -3,6 +3,8 @@
 import sys
 from math import ceil, floor
 
+import numpy as np
+
 # For Pluto fft_size is 1024, capture_bw is 61.44, filter_bw is 56
 fft_size   = 2048
 capture_bw = 100
@@ -53,6 +55,53 @@ def bins_calc (ccf, bcf, bw):
     print (0, br, "and", bl, fft_size-1)
 
 
+def bins_calc_batch (ccf, bcf_arr, bw_arr):
+  '''
+  Vectorized version of bins_calc for sweeping many bands at once.
+  Takes one capture center frequency and arrays of band center
+  frequencies and bandwidths, and returns a structured array with
+  fields valid, lf, rf, bl and br. Bands outside the filter range
+  have valid set to False and -1 bin numbers.
+  '''
+  bcf_arr = np.asarray(bcf_arr, dtype=np.float64)
+  bw_arr  = np.asarray(bw_arr, dtype=np.float64)
+
+  binw = capture_bw/fft_size
+  cl   = ccf - (capture_bw*1.0/2)
+  fl   = ccf - (filter_bw*1.0/2)
+  fr   = ccf + (filter_bw*1.0/2)
+  bl   = bcf_arr - (bw_arr*0.5)
+  br   = bcf_arr + (bw_arr*0.5)
+
+  valid = (bl>=fl) & (br<=fr)
+
+  # Compute FFT bin number, round to avoid python float errors
+  bl = np.round((bl - cl)/binw, rnd_digits)
+  br = np.round((br - cl)/binw, rnd_digits)
+
+  # find the integer values for bin number
+  bl = np.floor(bl).astype(np.int64)
+  br = np.where(np.ceil(br)==br, br-1, np.floor(br)).astype(np.int64)
+
+  # Frequency range captured
+  lf = np.round(cl + bl*binw, rnd_digits)
+  rf = np.round(cl + (br+1)*binw, rnd_digits)
+
+  # FFT half window shift, so center frequency is at bin 0
+  bl = bl ^ half_fft
+  br = br ^ half_fft
+
+  out = np.zeros(bcf_arr.shape, dtype=[('valid',np.bool_),
+                                       ('lf',np.float64), ('rf',np.float64),
+                                       ('bl',np.int64), ('br',np.int64)])
+  out['valid'] = valid
+  out['lf'] = np.where(valid, lf, np.nan)
+  out['rf'] = np.where(valid, rf, np.nan)
+  out['bl'] = np.where(valid, bl, -1)
+  out['br'] = np.where(valid, br, -1)
+  return out
+
+
 if __name__ == "__main__":
   if (len(sys.argv)<4):
     print ("Missing arguments: <capture center freq> <band center freq> <bandwidth>")
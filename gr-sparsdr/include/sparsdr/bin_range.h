@@ -0,0 +1,70 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2022 The Regents of the University of California.
+ *
+ * This is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 3, or (at your option)
+ * any later version.
+ *
+ * This software is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this software; see the file COPYING.  If not, write to
+ * the Free Software Foundation, Inc., 51 Franklin Street,
+ * Boston, MA 02110-1301, USA.
+ */
+
+#ifndef INCLUDED_SPARSDR_BIN_RANGE_H
+#define INCLUDED_SPARSDR_BIN_RANGE_H
+#include <cstdint>
+
+namespace gr {
+namespace sparsdr {
+
+/*!
+ * \brief A range of bins to unmask, with the threshold to apply to them
+ *
+ * This is the already-parsed form of one threshold group in a bin
+ * specification string (see compressing_source::set_bin_spec).
+ */
+class bin_range
+{
+private:
+    /*! \brief The first bin in the range (included) */
+    uint16_t d_start_bin;
+    /*! \brief The end of the range (excluded) */
+    uint16_t d_end_bin;
+    /*! \brief The threshold to apply to every bin in the range */
+    uint32_t d_threshold;
+
+public:
+    /*!
+     * \brief Creates a bin range
+     *
+     * \param start_bin the first bin in the range (included)
+     * \param end_bin the end of the range (excluded)
+     * \param threshold the threshold to apply to every bin in the range
+     */
+    inline bin_range(uint16_t start_bin, uint16_t end_bin, uint32_t threshold)
+        : d_start_bin(start_bin), d_end_bin(end_bin), d_threshold(threshold)
+    {
+    }
+
+    /*!
+     * \brief Creates an empty bin range with a threshold of zero
+     */
+    inline bin_range() : d_start_bin(0), d_end_bin(0), d_threshold(0) {}
+
+    inline uint16_t start_bin() const { return d_start_bin; }
+    inline uint16_t end_bin() const { return d_end_bin; }
+    inline uint32_t threshold() const { return d_threshold; }
+};
+
+} // namespace sparsdr
+} // namespace gr
+
+#endif
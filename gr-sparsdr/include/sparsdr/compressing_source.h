@@ -22,17 +22,14 @@
 #define INCLUDED_SPARSDR_COMPRESSING_SOURCE_H
 
 #include <sparsdr/api.h>
+#include <sparsdr/bin_range.h>
 #include <cstdint>
 #include <string>
+#include <vector>
 
 namespace gr {
 namespace sparsdr {
 
-namespace {
-// Forward-declare this class that is used only in compressing_source.cc
-struct bin_range;
-} // namespace
-
 /**
  * This is a base class for a device that runs SparSDR compression and allows
  * the compression settings to be configured.
@@ -175,6 +172,19 @@ public:
      */
     virtual void set_bin_spec(const std::string& spec);
 
+    /**
+     * Sets the thresholds and masks for all 1024 bins from already-parsed
+     * bin ranges
+     *
+     * This is equivalent to set_bin_spec(), but takes the parsed form
+     * directly, so callers that know their bin ranges in advance (or apply
+     * the same ranges repeatedly) do not pay for string parsing.
+     *
+     * Any bins not covered by a range will be masked (preventing them from
+     * sending any samples).
+     */
+    virtual void set_bin_ranges(const std::vector<bin_range>& ranges);
+
     /**
      * Sets the weight used to calculate the average signal level for each bin
      *
@@ -56,12 +56,17 @@ public:
      * when there were no active signals
      * \param compression_fft_size the number of bins in the FFT used to
      * compress the received signals
+     * \param scale an additional gain applied to every reconstructed sample.
+     * This is folded into the normalization inside the reconstruction
+     * process, so it does not cost an extra pass over the samples. It can
+     * replace a separate multiply-const block after this block.
      */
     static sptr make(std::vector<::gr::sparsdr::band_spec> bands,
                      const std::string& reconstruct_path = "sparsdr_reconstruct",
                      const std::string& sample_format = "N210 v1",
                      bool zero_gaps = false,
-                     unsigned int compression_fft_size = 1024);
+                     unsigned int compression_fft_size = 1024,
+                     float scale = 1.0f);
 };
 
 } // namespace sparsdr
@@ -54,10 +54,11 @@ reconstruct::sptr reconstruct::make(std::vector<band_spec> bands,
                                     const std::string& reconstruct_path,
                                     const std::string& sample_format,
                                     bool zero_gaps,
-                                    unsigned int compression_fft_size)
+                                    unsigned int compression_fft_size,
+                                    float scale)
 {
     return gnuradio::get_initial_sptr(new reconstruct_impl(
-        bands, reconstruct_path, sample_format, zero_gaps, compression_fft_size));
+        bands, reconstruct_path, sample_format, zero_gaps, compression_fft_size, scale));
 }
 
 /*
@@ -67,7 +68,8 @@ reconstruct_impl::reconstruct_impl(const std::vector<band_spec>& bands,
                                    const std::string& reconstruct_path,
                                    const std::string& sample_format,
                                    bool zero_gaps,
-                                   unsigned int compression_fft_size)
+                                   unsigned int compression_fft_size,
+                                   float scale)
     : gr::hier_block2(
           "reconstruct",
           // One input for compressed samples
@@ -81,12 +83,13 @@ reconstruct_impl::reconstruct_impl(const std::vector<band_spec>& bands,
       d_temp_dir(),
       d_child(0)
 {
-    start_subprocess(sample_format, zero_gaps, compression_fft_size);
+    start_subprocess(sample_format, zero_gaps, compression_fft_size, scale);
 }
 
 void reconstruct_impl::start_subprocess(const std::string& sample_format,
                                         bool zero_gaps,
-                                        unsigned int compression_fft_size)
+                                        unsigned int compression_fft_size,
+                                        float scale)
 {
     // Start assembling the command
     std::vector<std::string> arguments;
@@ -134,6 +137,10 @@ void reconstruct_impl::start_subprocess(const std::string& sample_format,
     } else {
         throw std::runtime_error("Unsupported sample format");
     }
+    if (scale != 1.0f) {
+        arguments.push_back("--output-scale");
+        arguments.push_back(boost::lexical_cast<std::string>(scale));
+    }
 
     // Create a temporary directory for the pipes
     std::string temp_dir("sparsdr_reconstruct_XXXXXX");
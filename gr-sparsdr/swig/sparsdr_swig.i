@@ -8,14 +8,18 @@
 %include "std_vector.i"
 %{
 #include "sparsdr/band_spec.h"
+#include "sparsdr/bin_range.h"
 #include "sparsdr/simple_band_spec.h"
 %}
 %include "sparsdr/band_spec.h"
+%include "sparsdr/bin_range.h"
 %include "sparsdr/simple_band_spec.h"
 
 // Required to support the bands argument in the reconstruct block make function
+// and the ranges argument of compressing_source::set_bin_ranges
 namespace std {
     %template(band_spec_vector) vector<::gr::sparsdr::band_spec>;
+    %template(bin_range_vector) vector<::gr::sparsdr::bin_range>;
     %template(simple_band_spec_vector) vector<::gr::sparsdr::simple_band_spec>;
 }
 
@@ -54,6 +54,8 @@ pub struct Args {
     pub channel_capacity: usize,
     /// The overlap mode
     pub overlap: OverlapMode,
+    /// Additional scaling factor applied to reconstructed samples
+    pub output_scale: f32,
 }
 
 /// General help text
@@ -325,6 +327,19 @@ impl Args {
                     .value_name("samples")
                     .help("The number of output zero samples written in time gaps"),
             )
+            .arg(
+                Arg::with_name("output_scale")
+                    .long("output-scale")
+                    .takes_value(true)
+                    .default_value("1.0")
+                    .validator(validate::<f32>)
+                    .value_name("factor")
+                    .help(
+                        "An additional scaling factor applied to every reconstructed sample. \
+                    This is folded into the inverse FFT normalization, so it does not cost an \
+                    extra pass over the samples.",
+                    ),
+            )
             .arg(
                 Arg::with_name("zero_gaps")
                 .long("zero-gaps")
@@ -445,6 +460,7 @@ impl Args {
                 .parse()
                 .unwrap(),
             overlap,
+            output_scale: matches.value_of("output_scale").unwrap().parse().unwrap(),
         }
     }
 }
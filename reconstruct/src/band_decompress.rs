@@ -34,6 +34,8 @@ pub struct BandSetup<'w> {
     pub fc_bins: f32,
     /// Fractional part of center frequency offset, in bins
     pub bin_offset: f32,
+    /// Additional scaling factor applied to reconstructed samples
+    pub scale: f32,
     /// Time to wait for a compressed sample before flushing output
     pub timeout: Duration,
     /// The destination to write decompressed samples to
@@ -65,6 +67,8 @@ pub struct BandSetupBuilder<'w> {
     bins: u16,
     /// The inverse FFT size
     fft_bins: u16,
+    /// Additional scaling factor applied to reconstructed samples
+    scale: f32,
     /// Time to wait for a compressed sample before flushing output
     timeout: Duration,
     /// The destination to write decompressed samples to
@@ -89,11 +93,16 @@ impl<'w> BandSetupBuilder<'w> {
             compression_fft_size,
             bins,
             fft_bins,
+            scale: 1.0,
             timeout: TIMEOUT,
             destination,
             time_log: None,
         }
     }
+    /// Sets the additional scaling factor applied to reconstructed samples
+    pub fn scale(self, scale: f32) -> Self {
+        BandSetupBuilder { scale, ..self }
+    }
     /// Sets the center frequency to decompress
     pub fn center_frequency(self, center_frequency: f32) -> Self {
         BandSetupBuilder {
@@ -151,6 +160,7 @@ impl<'w> BandSetupBuilder<'w> {
             fft_size,
             bin_offset,
             fc_bins,
+            scale: self.scale,
             timeout: self.timeout,
             destination: self.destination,
             time_log: self.time_log,
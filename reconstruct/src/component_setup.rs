@@ -89,6 +89,7 @@ where
                 compression_fft_size,
                 fft_size: band_setup.fft_size,
                 fc_bins: band_setup.fc_bins,
+                scale: band_setup.scale,
                 timeout: band_setup.timeout,
                 overlap: overlap_mode.clone(),
                 outputs: vec![],
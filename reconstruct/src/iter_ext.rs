@@ -68,12 +68,13 @@ pub trait IterExt {
         PhaseCorrectIter::new(self, fc_bins)
     }
 
-    /// Applies an inverse FFT to windows
-    fn fft(self, compression_fft_size: usize, fft_size: u16) -> Fft<Self>
+    /// Applies an inverse FFT to windows, scaling the time-domain samples by scale
+    /// in addition to the FFT normalization
+    fn fft(self, compression_fft_size: usize, fft_size: u16, scale: f32) -> Fft<Self>
     where
         Self: Iterator<Item = Status<Window>> + Sized,
     {
-        Fft::new(self, compression_fft_size, usize::from(fft_size))
+        Fft::new(self, compression_fft_size, usize::from(fft_size), scale)
     }
 
     /// Overlaps windows with consecutive time values
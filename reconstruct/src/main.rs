@@ -132,7 +132,8 @@ fn run() -> io::Result<()> {
             band.bins,
             band.fft_bins,
         )
-        .center_frequency(band.center_frequency);
+        .center_frequency(band.center_frequency)
+        .scale(setup.output_scale);
         decompress_setup.add_band(band_setup.build());
     }
 
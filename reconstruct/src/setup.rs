@@ -54,6 +54,8 @@ pub struct Setup {
     /// Capacity of input -> FFT/output stage channels
     pub channel_capacity: usize,
     pub overlap_mode: OverlapMode,
+    /// Additional scaling factor applied to reconstructed samples
+    pub output_scale: f32,
 }
 
 /// The setup for decompressing a band
@@ -120,6 +122,7 @@ impl Setup {
             progress_bar: args.progress_bar,
             channel_capacity: args.channel_capacity,
             overlap_mode: args.overlap,
+            output_scale: args.output_scale,
         })
     }
 }
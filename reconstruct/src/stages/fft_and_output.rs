@@ -74,6 +74,8 @@ pub struct FftAndOutputSetup<'w> {
     pub fft_size: u16,
     /// Floor of the center frequency offset, in bins
     pub fc_bins: f32,
+    /// Additional scaling factor applied to time-domain samples
+    pub scale: f32,
     /// Time to wait for a compressed sample before flushing output
     pub timeout: Duration,
     /// Overlap mode (gaps or flush samples)
@@ -125,7 +127,7 @@ pub fn run_fft_and_output_stage(
         .filter_bins(setup.bins, setup.fft_size)
         .shift(setup.fft_size)
         .phase_correct(setup.fc_bins)
-        .fft(setup.compression_fft_size, setup.fft_size);
+        .fft(setup.compression_fft_size, setup.fft_size, setup.scale);
 
     let fft_chain = match setup.overlap {
         OverlapMode::Gaps => fft_chain.overlap_gaps(usize::from(setup.fft_size)),
@@ -44,7 +44,10 @@ pub struct Fft<I> {
 
 impl<I> Fft<I> {
     /// Creates a new FFT step
-    pub fn new(inner: I, compression_fft_size: usize, fft_size: usize) -> Self {
+    ///
+    /// extra_scale is an additional factor applied to every time-domain sample,
+    /// folded into the existing normalization so it costs no extra pass.
+    pub fn new(inner: I, compression_fft_size: usize, fft_size: usize, extra_scale: f32) -> Self {
         let fft = C2CPlan32::aligned(&[fft_size], Sign::Backward, Flag::MEASURE)
             .expect("Failed to create FFT");
         let decimation = compression_fft_size / fft_size;
@@ -55,7 +58,7 @@ impl<I> Fft<I> {
             .sum::<f32>();
         info!("Window sum {}", window_sum);
         let hop = compression_fft_size / 2 / decimation;
-        let scale = hop as f32 / window_sum / (decimation as f32 * fft_size as f32);
+        let scale = extra_scale * hop as f32 / window_sum / (decimation as f32 * fft_size as f32);
         info!("Scale {}", scale);
 
         Fft {
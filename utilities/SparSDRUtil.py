@@ -1,34 +1,42 @@
 #!/usr/bin/env python3
 
-from sys import stdin
-from struct import unpack
+import os
+from concurrent.futures import ProcessPoolExecutor
 import warnings
 import numpy as np
 
-def parsePlutoV2(filename,fft_size_log2=10):
+# Numba is optional: when present the V2 state machine is compiled to
+# native code, otherwise the same function runs as plain Python
+try:
+  from numba import njit
+except ImportError:
+  njit = None
+
+def _decode_v2(raw, fft_size_log2, max_avg, magIdxArr, avgTickArr, avgMagArr, fftNoArr, fftIdxArr, fftTickArr, realArr, imagArr):
   '''
-  Function that parses and returns a compressed capture
-  from a Pluto in the V2 format.
-  :input: filename :string: Full path to compressed file
+  V2 decode state machine over a pre-loaded uint32 array, writing into
+  preallocated output arrays instead of growing Python lists.
+  :input: raw :nparray:uint32: Raw capture words
   :input: fft_size_log2 :int: log2(NFFT), has to be 1024 or less
-
-  :output: magIdxList :list:int: Bin Index of magnitude average value 
-  :output: fixedAvgTimeList :list:int: Time corresponding to average window
-  :output: avgMagnitudeList :list:int: Magnitude average value per bin
-  :output: fftNoList :list:int: The index of the FFT window
-  :output: fftIndexList :list:int: The index of the bin within the FFT window
-  :output: fixedFftTimeList :list:int: Time corresponding to the FFT window
-  :output: realList :list:int: Real part of bin value
-  :output: imagList :list:int: Imaginary part of bin value
+  :input: max_avg :int: Stop decoding once this many average samples
+  have been collected; negative means no limit
+  The remaining inputs are output arrays of at least len(raw) entries.
+  Times are written as integer clock ticks; the caller applies the
+  tick-to-nanosecond scale once, vectorized, so this loop stays in
+  pure integer arithmetic.
+
+  :output: n_avg :int: Number of average samples written
+  :output: n_fft :int: Number of FFT samples written
+
+  The body is kept free of Python-only constructs so that Numba can
+  compile it when available; without Numba it runs unmodified.
   '''
+  FFT_size = 2**fft_size_log2
 
-  max_fft_size_log2 = 10
-  FFT_size          = 2**fft_size_log2
-
-  fft_time_offset = int(0)
-  avg_time_offset = int(0)
-  last_fft_time   = int(0)
-  last_avg_time   = int(0)
+  fft_time_offset = 0
+  avg_time_offset = 0
+  last_fft_time   = 0
+  last_avg_time   = 0
 
   first_zero = 0
   after_zero = False
@@ -37,38 +45,22 @@ def parsePlutoV2(filename,fft_size_log2=10):
   after_hdr  = False
   FFT_index  = 0
 
-  # Clock is 61.44MHz, and we cut (fft_size_log-1) bits to show start of window
-  ts = 16.2760417 * (1 << (fft_size_log2-1))
-
-  v1_time_bits  = 32-1-max_fft_size_log2
-  v1_time_mask  = (2**(v1_time_bits))-1
+  fixed_avg_ticks = 0
+  fixed_fft_ticks = 0
 
-  magIdxList = []
-  fixedAvgTimeList = []
-  avgMagnitudeList = []
+  n_avg = 0
+  n_fft = 0
 
-  fftNoList = []
-  fftIndexList = []
-  fixedFftTimeList = []
-  realList = []
-  imagList = []
-
-  fhandle = open(filename, 'rb')
-  while True:
-    b = fhandle.read(4)
-    if (len(b) < 4):
+  for k in range(raw.shape[0]):
+    if max_avg >= 0 and n_avg >= max_avg:
       break
 
-    (value, )    = unpack("I", b)
-    (imag, real) = unpack("hh", b)
+    value = np.int64(raw[k])
 
     is_hdr = (value >> 31) & 0x1
     is_avg = (value >> 30) & 0x1
-    time   = (value & 0x3FFFFFFF);
-    index  = (value & 0x3FF)
-    fft_no = time & 0x1 # simply odd or even time for start of window
-    
-    # print ("if hdr:", is_hdr, is_avg, time, "if data:", value)
+    time   = value & 0x3FFFFFFF
+    index  = value & 0x3FF
 
     if (first_zero!=2):
       if (first_zero==0):
@@ -105,8 +97,8 @@ def parsePlutoV2(filename,fft_size_log2=10):
             avg_time_offset += (1<<30)
           last_avg_time = time
           # Average sample times always have fft_size_log bits tail zero
-          fixed_avg_time = ((time & 0x3FFFFFFE) + avg_time_offset) * ts
-          # print ("Average header at time", fixed_avg_time,"(ns)")
+          fixed_avg_ticks = (time & 0x3FFFFFFE) + avg_time_offset
+          # print ("Average header at tick", fixed_avg_ticks)
           FFT_index = 0
           in_avg = True
           in_FFT = False
@@ -115,8 +107,8 @@ def parsePlutoV2(filename,fft_size_log2=10):
           if (time < last_fft_time):
             fft_time_offset += (1<<30)
           last_fft_time = time
-          fixed_fft_time = (time + fft_time_offset) * ts
-          # print ("FFT header at time", fixed_fft_time,"(ns)")
+          fixed_fft_ticks = time + fft_time_offset
+          # print ("FFT header at tick", fixed_fft_ticks)
           in_avg = False
           in_FFT = True
           after_hdr = True
@@ -127,9 +119,10 @@ def parsePlutoV2(filename,fft_size_log2=10):
     else:
       if (in_avg):
         # print ("Average, index", FFT_index, ":", value)
-        magIdxList.append(FFT_index)
-        avgMagnitudeList.append(index)
-        fixedAvgTimeList.append(fixed_avg_time)
+        magIdxArr[n_avg] = FFT_index
+        avgMagArr[n_avg] = index
+        avgTickArr[n_avg] = fixed_avg_ticks
+        n_avg += 1
         FFT_index += 1
       else:
         if (after_hdr):
@@ -138,15 +131,339 @@ def parsePlutoV2(filename,fft_size_log2=10):
           after_hdr = False
         else:
           # print ("FFT, index", FFT_index, ":", real, ",", imag, "( power =", (real*real)+(imag*imag), ")")
-          fftNoList.append(time)
-          fftIndexList.append(FFT_index)
-          fixedFftTimeList.append(fixed_fft_time)
-          realList.append(real)
-          imagList.append(imag)
+          fftNoArr[n_fft] = time
+          fftIdxArr[n_fft] = FFT_index
+          fftTickArr[n_fft] = fixed_fft_ticks
+          # Sign-extend the two halves of the word already in hand,
+          # instead of unpacking the same four bytes a second time
+          lo = value & 0xFFFF
+          hi = (value >> 16) & 0xFFFF
+          imagArr[n_fft] = (lo ^ 0x8000) - 0x8000
+          realArr[n_fft] = (hi ^ 0x8000) - 0x8000
+          n_fft += 1
 
           FFT_index += 1
-  fhandle.close()
-  return magIdxList, fixedAvgTimeList, avgMagnitudeList, fftNoList, fftIndexList, fixedFftTimeList, realList, imagList
+
+  return n_avg, n_fft
+
+if njit is not None:
+  _decode_v2 = njit(cache=True)(_decode_v2)
+
+def parsePlutoV2(filename,fft_size_log2=10,max_windows=None):
+  '''
+  Function that parses and returns a compressed capture
+  from a Pluto in the V2 format.
+  :input: filename :string: Full path to compressed file
+  :input: fft_size_log2 :int: log2(NFFT), has to be 1024 or less
+  :input: max_windows :int: If set, stop decoding after this many
+  average windows have been collected
+
+  :output: magIdxList :nparray:int: Bin Index of magnitude average value
+  :output: fixedAvgTimeList :nparray:float: Time corresponding to average window
+  :output: avgMagnitudeList :nparray:int: Magnitude average value per bin
+  :output: fftNoList :nparray:int: The index of the FFT window
+  :output: fftIndexList :nparray:int: The index of the bin within the FFT window
+  :output: fixedFftTimeList :nparray:float: Time corresponding to the FFT window
+  :output: realList :nparray:int: Real part of bin value
+  :output: imagList :nparray:int: Imaginary part of bin value
+  '''
+
+  # Read the whole capture in one shot; the state machine runs over the
+  # array in _decode_v2 (Numba-compiled when available)
+  raw = np.fromfile(filename, dtype='<u4')
+  n   = raw.shape[0]
+
+  max_avg = -1 if max_windows is None else max_windows * (2**fft_size_log2)
+
+  # Preallocated at the upper bound (every word a sample) and sliced to
+  # the decoded lengths below, so no per-sample list growth or boxing
+  magIdxArr  = np.empty(n, dtype=np.int64)
+  avgTickArr = np.empty(n, dtype=np.int64)
+  avgMagArr  = np.empty(n, dtype=np.int64)
+  fftNoArr   = np.empty(n, dtype=np.int64)
+  fftIdxArr  = np.empty(n, dtype=np.int64)
+  fftTickArr = np.empty(n, dtype=np.int64)
+  realArr    = np.empty(n, dtype=np.int16)
+  imagArr    = np.empty(n, dtype=np.int16)
+
+  n_avg, n_fft = _decode_v2(raw, fft_size_log2, max_avg, magIdxArr, avgTickArr, avgMagArr, fftNoArr, fftIdxArr, fftTickArr, realArr, imagArr)
+
+  # Clock is 61.44MHz, and we cut (fft_size_log-1) bits to show start of window.
+  # The kernel records integer ticks; one vectorized multiply converts to ns.
+  ts = 16.2760417 * (1 << (fft_size_log2-1))
+
+  return magIdxArr[:n_avg], avgTickArr[:n_avg] * ts, avgMagArr[:n_avg], fftNoArr[:n_fft], fftIdxArr[:n_fft], fftTickArr[:n_fft] * ts, realArr[:n_fft], imagArr[:n_fft]
+
+def _classify_v2(words, FFT_size, index_mask, kindArr, aArr, bArr, cArr, dArr, eArr):
+  '''
+  Per-word event classification for decodeV2Stream. Runs the V2 state
+  machine over a uint32 array and records one event per word: a kind
+  code in kindArr and the event fields in the payload arrays (ticks for
+  headers; index/value/real/imag/time for samples). Integer-only so it
+  compiles under Numba when available, like _decode_v2.
+  Kind codes: 0 sync, 1 end_frame, 2 bad_window, 3 avg_hdr, 4 fft_hdr,
+  5 fft_index, 6 avg, 7 fft.
+  '''
+  fft_time_offset = 0
+  avg_time_offset = 0
+  last_fft_time   = 0
+  last_avg_time   = 0
+
+  first_zero = 0
+  after_zero = False
+  in_FFT     = True
+  in_avg     = False
+  after_hdr  = False
+  FFT_index  = 0
+
+  for k in range(words.shape[0]):
+    value  = np.int64(words[k])
+    is_hdr = (value >> 31) & 0x1
+    is_avg = (value >> 30) & 0x1
+    time   = (value & 0x3FFFFFFF)
+    index  = value & index_mask
+
+    if (first_zero!=2):
+      if (first_zero==0):
+        if (value==0):
+          first_zero = 1
+        kindArr[k] = 0
+        continue
+      else: # potential first zero
+        if (value==0):
+          kindArr[k] = 0
+          continue
+        elif (is_hdr==0):
+          first_zero = 0 # reset the search
+          kindArr[k] = 0
+          continue
+        else:
+          first_zero = 2
+          after_zero = True
+          fft_time_offset = -time
+          avg_time_offset = -time
+
+    if (in_FFT and (value==0)) or (in_avg and (FFT_index==FFT_size) and (value==0)):
+      after_zero = True
+      kindArr[k] = 1
+      continue
+
+    if (after_zero):
+      if (value==0):
+        first_zero=1
+        kindArr[k] = 2
+      elif (is_hdr!=0):
+        if (is_avg!=0):
+          if (time < last_avg_time):
+            avg_time_offset += (1<<30)
+          last_avg_time = time
+          kindArr[k] = 3
+          # Average sample times always have fft_size_log bits tail zero
+          aArr[k] = (time & 0x3FFFFFFE) + avg_time_offset
+          FFT_index = 0
+          in_avg = True
+          in_FFT = False
+        else:
+          if (time < last_fft_time):
+            fft_time_offset += (1<<30)
+          last_fft_time = time
+          kindArr[k] = 4
+          aArr[k] = time + fft_time_offset
+          in_avg = False
+          in_FFT = True
+          after_hdr = True
+      else:
+        kindArr[k] = 5
+        FFT_index = index
+      after_zero = False
+    else:
+      if (in_avg):
+        kindArr[k] = 6
+        aArr[k] = FFT_index
+        dArr[k] = value
+        eArr[k] = last_avg_time
+        FFT_index += 1
+      else:
+        if (after_hdr):
+          FFT_index = index
+          kindArr[k] = 5
+          after_hdr = False
+        else:
+          # Sign-extend the two halves of the word already in hand
+          lo = value & 0xFFFF
+          hi = value >> 16
+          kindArr[k] = 7
+          aArr[k] = FFT_index
+          bArr[k] = (hi ^ 0x8000) - 0x8000
+          cArr[k] = (lo ^ 0x8000) - 0x8000
+          dArr[k] = value
+          eArr[k] = last_fft_time
+          FFT_index += 1
+
+if njit is not None:
+  _classify_v2 = njit(cache=True)(_classify_v2)
+
+def decodeV2Stream(buf, fft_size_log2, index_mask=0x3FF, tick_ns=16.2760417):
+  '''
+  Run the V2 decode state machine over a buffer of 4-byte words and
+  yield one event tuple per input word. This is the single entry point
+  shared by the V2 stdin parser scripts; the Pluto and N210 variants
+  differ only in FFT size and index masking. The state machine itself
+  lives in _classify_v2 (Numba-compiled when available, like the
+  _decode_v2 kernel parsePlutoV2 uses); this generator only builds the
+  event tuples from the arrays it fills.
+  :input: buf :bytes: Raw little-endian capture words
+  :input: fft_size_log2 :int: log2(NFFT)
+  :input: index_mask :int: Mask applied to a word to extract a bin index
+  :input: tick_ns :float: Nanoseconds per clock tick
+
+  Yielded events (first element is the kind):
+  ('sync',)                       searching for a proper header
+  ('end_frame',)                  end of a window
+  ('bad_window',)                 error detecting a window
+  ('avg_hdr', fixed_avg_time)     average header with time in ns
+  ('fft_hdr', fixed_fft_time)     FFT header with time in ns
+  ('fft_index',)                  FFT bin index word
+  ('avg', FFT_index, value, last_avg_time)
+  ('fft', FFT_index, real, imag, value, last_fft_time)
+  '''
+  FFT_size = 2**fft_size_log2
+
+  # Clock is 61.44MHz, and we cut (fft_size_log-1) bits to show start of window
+  ts = tick_ns * (1 << (fft_size_log2-1))
+
+  words = np.frombuffer(buf, dtype='<u4', count=len(buf)//4)
+  n     = words.shape[0]
+
+  # One event per word; the kernel fills a kind code plus the payload
+  # lanes each event kind uses
+  kindArr = np.empty(n, dtype=np.int8)
+  aArr    = np.empty(n, dtype=np.int64)
+  bArr    = np.empty(n, dtype=np.int64)
+  cArr    = np.empty(n, dtype=np.int64)
+  dArr    = np.empty(n, dtype=np.int64)
+  eArr    = np.empty(n, dtype=np.int64)
+
+  _classify_v2(words, FFT_size, index_mask, kindArr, aArr, bArr, cArr, dArr, eArr)
+
+  kind = kindArr.tolist()
+  a    = aArr.tolist()
+  b    = bArr.tolist()
+  c    = cArr.tolist()
+  d    = dArr.tolist()
+  e    = eArr.tolist()
+
+  for k in range(n):
+    code = kind[k]
+    if code == 7:
+      yield ('fft', a[k], b[k], c[k], d[k], e[k])
+    elif code == 6:
+      yield ('avg', a[k], d[k], e[k])
+    elif code == 0:
+      yield ('sync',)
+    elif code == 4:
+      yield ('fft_hdr', a[k] * ts)
+    elif code == 3:
+      yield ('avg_hdr', a[k] * ts)
+    elif code == 5:
+      yield ('fft_index',)
+    elif code == 1:
+      yield ('end_frame',)
+    else: # 2
+      yield ('bad_window',)
+
+def _unwrapTicks(t, time_bits):
+  '''
+  Vectorized monotonic-time unwrap: every backwards step in t marks one
+  wrap of the time_bits-bit counter, so the per-element offset to add
+  is a prefix sum over those steps. Replaces the scalar running-state
+  comparison so callers stay fully in array operations.
+  :input: t :nparray:int: Tick values in arrival order
+  :input: time_bits :int: Width of the hardware time counter
+  :output: offsets :nparray:int: Wrap offset to add to each element
+  '''
+  if t.size == 0:
+    return np.empty(0, dtype=np.int64)
+  return np.cumsum(np.diff(t, prepend=t[:1]) < 0, dtype=np.int64) << time_bits
+
+def decodeV1Records(buf, fft_size_log2, max_fft_size_log2=10, tick_ns=16.2760417, hdr_first=False):
+  '''
+  Decode a buffer of 8-byte V1 records, fully vectorized, keeping the
+  results in record order. This is the single copy of the V1 decode
+  shared by parsePlutoV1 and the V1 stdin parser scripts; the Pluto and
+  N210 formats differ in header word placement, maximum FFT size, and
+  clock rate.
+  :input: buf :bytes: Raw little-endian capture records
+  :input: fft_size_log2 :int: log2(NFFT)
+  :input: max_fft_size_log2 :int: log2 of the largest supported NFFT
+  :input: tick_ns :float: Nanoseconds per clock tick
+  :input: hdr_first :bool: True if the header is the low word of a
+  record (N210) rather than the high word (Pluto)
+
+  :output: is_avg :nparray:bool: True where a record is an average
+  :output: index :nparray:int: Bin index of each record
+  :output: fixed_time :nparray:float: Time of each record in ns
+  :output: avg_magnitude :nparray:int: Magnitude word of each record
+  :output: fft_no :nparray:int: Odd/even window bit of each record
+  :output: real :nparray:int: Real part of each record
+  :output: imag :nparray:int: Imaginary part of each record
+  '''
+  index_mask = (2**max_fft_size_log2)-1
+  time_bits  = 32-1-max_fft_size_log2
+  time_mask  = (2**(time_bits))-1
+
+  # Clock ticks are cut by (fft_size_log-1) bits to show start of window
+  ts = tick_ns * (1 << (fft_size_log2-1))
+
+  rec = np.frombuffer(buf, dtype='<u8', count=len(buf)//8)
+
+  if rec.size == 0:
+    empty_b = np.empty(0, dtype=np.bool_)
+    empty_i = np.empty(0, dtype=np.int64)
+    empty_f = np.empty(0, dtype=np.float64)
+    empty_h = np.empty(0, dtype='<i2')
+    return empty_b, empty_i, empty_f, empty_i, empty_i, empty_h, empty_h
+
+  halves = rec.view('<i2')
+  words  = rec.view('<u4')
+
+  if hdr_first:
+    hdr           = words[0::2]
+    avg_magnitude = words[1::2].astype(np.int64)
+    imag          = halves[2::4]
+    real          = halves[3::4]
+  else:
+    hdr           = words[1::2]
+    avg_magnitude = words[0::2].astype(np.int64)
+    imag          = halves[0::4]
+    real          = halves[1::4]
+
+  # The header lane is read several times below; hoist it out of the
+  # strided record view into a contiguous array once
+  hdr = np.ascontiguousarray(hdr)
+
+  is_avg = ((hdr >> 31) & 0x1).astype(np.bool_)
+  index  = ((hdr >> time_bits) & index_mask).astype(np.int64)
+  time   = (hdr & time_mask).astype(np.int64)
+  fft_no = time & 0x1 # simply odd or even time for start of window
+
+  # Both offsets start at minus the very first record's time
+  base_offset = -time[0]
+
+  is_fft = ~is_avg
+  t_avg  = time[is_avg]
+  t_fft  = time[is_fft]
+
+  # Each backwards step in the per-class time sequence is one counter wrap
+  avg_offset = base_offset + _unwrapTicks(t_avg, time_bits)
+  fft_offset = base_offset + _unwrapTicks(t_fft, time_bits)
+
+  fixed_time = np.empty(rec.size, dtype=np.float64)
+  # Average sample times always have fft_size_log bits tail zero
+  fixed_time[is_avg] = ((t_avg & (time_mask-1)) + avg_offset) * ts
+  fixed_time[is_fft] = (t_fft + fft_offset) * ts
+
+  return is_avg, index, fixed_time, avg_magnitude, fft_no, real, imag
 
 def parsePlutoV1(filename,fft_size_log2=10):
   '''
@@ -155,23 +472,46 @@ def parsePlutoV1(filename,fft_size_log2=10):
   :input: filename :string: Full path to compressed file
   :input: fft_size_log2 :int: log2(NFFT), has to be 1024 or less
 
-  :output: magIdxList :list:int: Bin Index of magnitude average value 
-  :output: fixedAvgTimeList :list:int: Time corresponding to average window
-  :output: avgMagnitudeList :list:int: Magnitude average value per bin
-  :output: fftNoList :list:int: The index of the FFT window
-  :output: fftIndexList :list:int: The index of the bin within the FFT window
-  :output: fixedFftTimeList :list:int: Time corresponding to the FFT window
-  :output: realList :list:int: Real part of bin value
-  :output: imagList :list:int: Imaginary part of bin value
+  :output: magIdxList :nparray:int: Bin Index of magnitude average value
+  :output: fixedAvgTimeList :nparray:float: Time corresponding to average window
+  :output: avgMagnitudeList :nparray:int: Magnitude average value per bin
+  :output: fftNoList :nparray:int: The index of the FFT window
+  :output: fftIndexList :nparray:int: The index of the bin within the FFT window
+  :output: fixedFftTimeList :nparray:float: Time corresponding to the FFT window
+  :output: realList :nparray:int: Real part of bin value
+  :output: imagList :nparray:int: Imaginary part of bin value
   '''
 
-  max_fft_size_log2 = 10
+  # The decode itself is shared with the stdin scripts; this just splits
+  # the record-order arrays into the average and FFT streams
+  with open(filename, 'rb') as fhandle:
+    buf = fhandle.read()
+
+  is_avg, index, fixed_time, avg_magnitude, fft_no, real, imag = decodeV1Records(buf, fft_size_log2)
+  is_fft = ~is_avg
+
+  return index[is_avg], fixed_time[is_avg], avg_magnitude[is_avg], fft_no[is_fft], index[is_fft], fixed_time[is_fft], real[is_fft], imag[is_fft]
+
+# Structured view of a V1 Pluto record, for zero-copy memory mapping
+_V1_RECORD_DTYPE = np.dtype([('imag', '<i2'), ('real', '<i2'), ('hdr', '<u4')])
+
+def parsePlutoV1_mmap(filename, fft_size_log2=10, max_windows=None):
+  '''
+  Memory-mapped fast path over a V1 Pluto capture that extracts only
+  the average magnitude stream, for the calibration pipeline. The file
+  is exposed as a structured array backed by the page cache, so no
+  explicit read or decode loop runs at all; FFT samples are never
+  touched. Matches parsePlutoV1(...)[0:3].
+  :input: filename :string: Full path to compressed file
+  :input: fft_size_log2 :int: log2(NFFT), has to be 1024 or less
+  :input: max_windows :int: If set, only this many average windows are
+  decoded
 
-  n               = int(0)
-  fft_time_offset = int(0)
-  avg_time_offset = int(0)
-  last_fft_time   = int(0)
-  last_avg_time   = int(0)
+  :output: magIdxList :nparray:int: Bin Index of magnitude average value
+  :output: fixedAvgTimeList :nparray:float: Time corresponding to average window
+  :output: avgMagnitudeList :nparray:int: Magnitude average value per bin
+  '''
+  max_fft_size_log2 = 10
 
   index_mask = (2**max_fft_size_log2)-1
   time_bits  = 32-1-max_fft_size_log2
@@ -180,66 +520,36 @@ def parsePlutoV1(filename,fft_size_log2=10):
   # Clock is 61.44MHz, and we cut (fft_size_log-1) bits to show start of window
   ts = 16.2760417 * (1 << (fft_size_log2-1))
 
-  # print ("#%-9s | %9s | %9s | %9s | %9s | %9s | %9s" % ("Sample", "Type", "FFT_No", "Index", "Time(ns)", "Real", "Imag"))
+  mm = np.memmap(filename, dtype=_V1_RECORD_DTYPE, mode='r')
 
-  fhandle = open(filename, 'rb')
+  if mm.size == 0:
+    return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64), np.empty(0, dtype=np.int64)
 
-  magIdxList = []
-  fixedAvgTimeList = []
-  avgMagnitudeList = []
+  hdr = mm['hdr']
 
-  fftNoList = []
-  fftIndexList = []
-  fixedFftTimeList = []
-  realList = []
-  imagList = []
+  # Both offsets start at minus the very first record's time
+  base_offset = -np.int64(hdr[0] & time_mask)
 
-  while True:
-    b = fhandle.read(8)
-    if (len(b) < 8):
-      break
-
-    (imag, real, hdr)  = unpack("hhI", b)
-    (avg_magnitude, _) = unpack("II", b)
+  avg_pos = np.flatnonzero((hdr >> 31) & 0x1)
+  if max_windows is not None:
+    avg_pos = avg_pos[:max_windows * (2**fft_size_log2)]
+  hdr_avg = hdr[avg_pos].astype(np.int64)
 
-    is_avg = (hdr >> 31) & 0x1
-    index  = (hdr >> time_bits) & index_mask
-    time   = (hdr & time_mask)
-    fft_no = time & 0x1 # simply odd or even time for start of window
+  index = (hdr_avg >> time_bits) & index_mask
+  t_avg = hdr_avg & time_mask
 
-    if (n==0):
-      fft_time_offset = -time
-      avg_time_offset = -time
-    n = n + 1
+  # Each backwards step in the avg time sequence is one counter wrap
+  avg_offset = base_offset + _unwrapTicks(t_avg, time_bits)
 
-    if (is_avg):
-      if (time < last_avg_time):
-        avg_time_offset += (1<<time_bits)
-        # print ("Average window time overflow: %d -> %d" % (last_avg_time, time))
-      last_avg_time = time
-      # Average sample times always have fft_size_log bits tail zero
-      fixed_avg_time = ((time & (time_mask-1)) + avg_time_offset) * ts
+  # Average sample times always have fft_size_log bits tail zero
+  fixed_avg_time = ((t_avg & (time_mask-1)) + avg_offset) * ts
 
-      magIdxList.append(index)
-      fixedAvgTimeList.append(fixed_avg_time)
-      avgMagnitudeList.append(avg_magnitude)
+  # The magnitude is the low word of the record, recombined unsigned
+  lo = mm['imag'][avg_pos].astype(np.int64) & 0xFFFF
+  hi = mm['real'][avg_pos].astype(np.int64) & 0xFFFF
+  avg_magnitude = (hi << 16) | lo
 
-    else:
-      if (time < last_fft_time):
-        fft_time_offset += (1<<time_bits)
-        # print ("FFT window time overflow: %d -> %d" % (last_fft_time, time))
-      last_fft_time = time
-      fixed_fft_time = (time + fft_time_offset) * ts
-      print ("% -10d    FFT sample % 10d  % 10d  % 10d  % 10d  % 10d (power=% 10d)" % (n, fft_no, index, fixed_fft_time, real, imag, (real*real)+(imag*imag)))
-
-      fftNoList.append(fft_no)
-      fftIndexList.append(index)
-      fixedFftTimeList.append(fixed_fft_time)
-      realList.append(real)
-      imagList.append(imag)
-
-  fhandle.close()
-  return magIdxList, fixedAvgTimeList, avgMagnitudeList, fftNoList, fftIndexList, fixedFftTimeList, realList, imagList
+  return index, fixed_avg_time, avg_magnitude
 
 def read_cshort_binary(filename):
   '''
@@ -247,22 +557,11 @@ def read_cshort_binary(filename):
   SparSDR disabled.
   :input: filname :string: Full path to file
   '''
-  fhandle = open(filename, 'rb')
-
-  realList = []
-  imagList = []
-
-  while True:
-    b = fhandle.read(4)
-    if (len(b) < 4):
-      break
-    (real, imag)  = unpack("hh", b)
-    realList.append(real)
-    imagList.append(imag)
-
-  fhandle.close()
+  # One bulk read instead of a 4-bytes-at-a-time unpack loop. complex64
+  # keeps half the memory of complex128 and is plenty for 12-bit samples.
+  arr = np.fromfile(filename, dtype='<i2').reshape(-1, 2)
 
-  complexArray = np.asarray(realList,dtype=float) + 1j * np.asarray(imagList,dtype=float)
+  complexArray = arr[:, 0].astype(np.float32) + 1j * arr[:, 1].astype(np.float32)
 
   return complexArray
 
@@ -290,7 +589,47 @@ def conservativeShiftPluto(nfft, estPAPRdB = 0, estBWMHz=1):
 
   return conservativeShift
 
-def computeShiftThresholdsPluto(nfft, rxGain, SparSDRVersion = 1, plutoSDRAvgFolder='/tmp/plutoSparSDRAvgValueFiles', filenameRxTemplate = 'avgSamples.dat'):
+def _parseAvgMagnitudes(args):
+  '''
+  Worker for the parallel calibration parse: returns only the average
+  magnitude stream of one capture. Module-level so it pickles for
+  ProcessPoolExecutor.
+  '''
+  fileName, SparSDRVersion, fftSizeLog2, maxWindows = args
+  if(SparSDRVersion==1):
+    # The calibration path only needs averages, so the zero-copy
+    # memory-mapped parser applies
+    return parsePlutoV1_mmap(fileName, fftSizeLog2, max_windows=maxWindows)[2]
+  else:
+    return parsePlutoV2(fileName, fftSizeLog2, max_windows=maxWindows)[2]
+
+def _polyfitQuadratic(y):
+  '''
+  Least-squares quadratic fit of y against x = 0..n-1, evaluated at x.
+  Equivalent to np.polyval(np.polyfit(x, y, 2), x), but the moment sums
+  over 0..n-1 are closed form (Faulhaber), so the fit reduces to one
+  3x3 solve instead of an SVD per call.
+  :input: y :nparray:float: Values to fit
+  :output: y1 :nparray:float: Fitted quadratic evaluated at 0..n-1
+  '''
+  n = y.shape[0]
+  s1 = n*(n-1)/2.0
+  s2 = n*(n-1)*(2*n-1)/6.0
+  s3 = s1*s1
+  s4 = n*(n-1)*(2*n-1)*(3*n*n-3*n-1)/30.0
+
+  x  = np.arange(n)
+  xy = x*y
+
+  A = np.array([[n,  s1, s2],
+                [s1, s2, s3],
+                [s2, s3, s4]])
+  b = np.array([y.sum(), xy.sum(), (x*xy).sum()])
+  p = np.linalg.solve(A, b)
+
+  return (p[2]*x + p[1])*x + p[0]
+
+def computeShiftThresholdsPluto(nfft, rxGain, SparSDRVersion = 1, plutoSDRAvgFolder='/tmp/plutoSparSDRAvgValueFiles', filenameRxTemplate = 'avgSamples.dat', maxWindows = 128):
   '''
   Compute suggested shift value and noise floor calibration 
   from average magnitude SparSDR captures performed without
@@ -302,6 +641,9 @@ def computeShiftThresholdsPluto(nfft, rxGain, SparSDRVersion = 1, plutoSDRAvgFol
   average file captures for each shift value
   :input: filenameRxTemplate :string: Template filename of
   each of the average file captures
+  :input: maxWindows :int: Number of average windows to use per
+  capture; the median stabilizes long before whole multi-GB files
+  are parsed. Pass None to use every window.
 
   :output: shiftValue :int: Suggested shift value that 
   brings the analog noise into the quantization range
@@ -316,26 +658,26 @@ def computeShiftThresholdsPluto(nfft, rxGain, SparSDRVersion = 1, plutoSDRAvgFol
   # shiftValue, binIdx, threshLinear, threshLinearOutliers, smooth2SidedMediandB
 
   fftSizeLog2 = int(np.log2(nfft));
-  binVec = range(nfft)
+
+  # fftshift as a precomputed index permutation: used both to reorder
+  # the medians inside the shift loop and as the shifted bin indices
+  shiftOrder = np.concatenate((np.arange(nfft//2, nfft), np.arange(nfft//2)))
 
   numShifts = 8;
 
   shiftValueVec = np.arange(7,-1,-1,dtype=int);
   rxGainVec = rxGain*np.ones((8,),dtype=int);
 
-  for idx in range(numShifts):
-    shiftValue = shiftValueVec[idx]
-    rxGain = rxGainVec[idx]
-    fileName = plutoSDRAvgFolder + '/' + filenameRxTemplate + '_' + str(shiftValue) + '_' + str(rxGain)
+  fileNames = [plutoSDRAvgFolder + '/' + filenameRxTemplate + '_' + str(shiftValueVec[idx]) + '_' + str(rxGainVec[idx]) for idx in range(numShifts)]
 
-    if(SparSDRVersion==1):
-      magIdxList, fixedAvgTimeList, avgMagnitudeList = parsePlutoV1(fileName, fftSizeLog2)[0:3]
-    else:
-      magIdxList, fixedAvgTimeList, avgMagnitudeList = parsePlutoV2(fileName, fftSizeLog2)[0:3]
+  # The captures are independent, so parse them in parallel; the shift
+  # search itself stays sequential over the cached magnitude streams
+  with ProcessPoolExecutor(max_workers=numShifts) as executor:
+    avgMagnitudeLists = list(executor.map(_parseAvgMagnitudes, [(fileName, SparSDRVersion, fftSizeLog2, maxWindows) for fileName in fileNames]))
 
-    magIdxList = np.asarray(magIdxList)
-    fixedAvgTimeList = np.asarray(fixedAvgTimeList)
-    avgMagnitudeList = np.asarray(avgMagnitudeList)
+  for idx in range(numShifts):
+    shiftValue = shiftValueVec[idx]
+    avgMagnitudeList = np.asarray(avgMagnitudeLists[idx])
 
     lengthAvgMagList = avgMagnitudeList.shape[0]
     lengthAvgMagListRound = int(np.floor(lengthAvgMagList/nfft)*nfft)
@@ -343,16 +685,18 @@ def computeShiftThresholdsPluto(nfft, rxGain, SparSDRVersion = 1, plutoSDRAvgFol
 
     avgMagnitudeMat = avgMagnitudeList.reshape((-1,nfft))
     avgMagnitudeMat = avgMagnitudeMat - 1
-    medianVals = np.median(avgMagnitudeMat,axis=0)
-    medianVals = np.fft.fftshift(medianVals)
+    medianVals = np.median(avgMagnitudeMat,axis=0)[shiftOrder]
     medianValsdB = 10*np.log10(medianVals)
 
-    convKernel = np.ones((8,))/8;
-    smooth2SidedMedian = np.convolve(medianVals,convKernel,mode='same')
+    # Running-sum boxcar: same windows as np.convolve with ones(8)/8 in
+    # 'same' mode (zero padding at the edges), but O(N) adds instead of
+    # O(8N) multiplies
+    c = np.concatenate(([0.0], np.cumsum(medianVals)))
+    idx = np.arange(nfft)
+    smooth2SidedMedian = (c[np.minimum(idx+4, nfft)] - c[np.maximum(idx-4, 0)]) / 8
     smooth2SidedMediandB = 10*np.log10(smooth2SidedMedian);
 
-    p = np.polyfit(binVec, smooth2SidedMediandB, 2);
-    y1 = np.polyval(p,binVec);
+    y1 = _polyfitQuadratic(smooth2SidedMediandB);
 
     if(np.sum((smooth2SidedMediandB)<0)==0):
       break
@@ -360,7 +704,7 @@ def computeShiftThresholdsPluto(nfft, rxGain, SparSDRVersion = 1, plutoSDRAvgFol
   estimError = smooth2SidedMediandB - y1;
   y2 = y1.copy();
   y2[estimError<4] = np.nan
-  binIdx = np.fft.fftshift(binVec)
+  binIdx = shiftOrder
   threshLinear = np.ceil(10**(y1/10))
   threshLinearOutliers = np.ceil(10**((y2+estimError)/10))
 
@@ -387,22 +731,20 @@ def saveConfigtoFilePluto(rxGain,estPAPRdB,estBWMHz,conservativeShiftValue,shift
   '''
   fhandle = open(filename, 'w');
 
-  fhandle.write('RxGaindB '+str(rxGain)+'\n')
-  fhandle.write('EstPAPRdB '+str(estPAPRdB)+'\n')
-  fhandle.write('estBWMHz '+str(estBWMHz)+'\n')
-  fhandle.write('ConservativeShift '+str(conservativeShiftValue)+'\n')
-  fhandle.write('SuggestedShift '+str(shiftValue)+'\n')
-
-  for binIter, threshIter, threshOutlierIter in zip(binIdx, threshLinear, threshLinearOutliers):
-    # print(binIter,threshIter,threshOutlierIter)
-    if not np.isnan(threshOutlierIter):
-      # print(binIter,threshIter,threshOutlierIter)
-      fhandle.write(str(binIter)+' '+str(threshOutlierIter)+'\n')
-    else:
-      # print(binIter,threshIter,threshOutlierIter)
-      fhandle.write(str(binIter)+' '+str(threshIter)+'\n')
+  # Pick the outlier threshold where one exists, in one vectorized
+  # select, and write the whole file in two calls instead of per bin
+  threshVals = np.where(np.isnan(threshLinearOutliers), threshLinear, threshLinearOutliers)
+
+  header = ('RxGaindB '+str(rxGain)+'\n'+
+            'EstPAPRdB '+str(estPAPRdB)+'\n'+
+            'estBWMHz '+str(estBWMHz)+'\n'+
+            'ConservativeShift '+str(conservativeShiftValue)+'\n'+
+            'SuggestedShift '+str(shiftValue)+'\n')
+  body = '\n'.join(str(binIter)+' '+str(threshIter) for binIter, threshIter in zip(binIdx, threshVals))
+
+  fhandle.write(header)
+  fhandle.write(body+'\n')
 
-  # pdb.set_trace();
   fhandle.close()
 
 def getThresholdBinShiftFromFile(filename='./thresholdConfig.txt', thresholdOffsetdB = 6, conserveShift = False):
@@ -441,17 +783,14 @@ def getThresholdBinShiftFromFile(filename='./thresholdConfig.txt', thresholdOffs
   SuggestedShift = int(line5.split()[1])
   # RxGain = line2.split()[1]
 
-  binIdx = []
-  threshVec = []
-  # Get the thresholds and bins
-  for line in fhandle:
-    binIdx.append(int(line.split()[0]))
-    threshVec.append(float(line.split()[1]))    
+  # Get the thresholds and bins as one bulk load instead of appending
+  # (and boxing) two values per line
+  data = np.loadtxt(fhandle, dtype=float, ndmin=2)
 
   fhandle.close()
 
-  binIdx = np.asarray(binIdx)
-  threshVec = np.asarray(threshVec,dtype=float)
+  binIdx = data[:, 0].astype(int)
+  threshVec = data[:, 1]
 
   if(conserveShift):
     binShift = np.ceil(ConservativeShift)
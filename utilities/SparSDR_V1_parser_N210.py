@@ -12,60 +12,47 @@
 # ==============
 # Total |    64
 
-from sys import stdin
-from struct import unpack
+from sys import stdin, stdout
 
-max_fft_size_log2 = 11
-fft_size_log2     = 11
-
-n               = int(0)
-fft_time_offset = int(0)
-avg_time_offset = int(0)
-last_fft_time  = int(0)
-last_avg_time  = int(0)
-
-index_mask = (2**max_fft_size_log2)-1
-time_bits  = 32-1-max_fft_size_log2
-time_mask  = (2**(time_bits))-1
-
-# Clock is 100mhz, and we cut (fft_size_log-1) bits to show start of window
-ts = 10 * (1 << (fft_size_log2-1))
-
-print ("#%-9s | %9s | %9s | %9s | %9s | %9s | %9s" % ("Sample", "Type", "FFT_No", "Index", "Time(ns)", "Real", "Imag"))
+import numpy as np
 
-while True:
-  b = stdin.buffer.read(8)
-  if (len(b) < 8):
-    break
+from SparSDRUtil import decodeV1Records
 
-  (hdr, imag, real)  = unpack("Ihh", b)
-  (_, avg_magnitude) = unpack("II", b)
-
-  is_avg = (hdr >> 31) & 0x1
-  index  = (hdr >> time_bits) & index_mask
-  time   = (hdr & time_mask)
-  fft_no = time & 0x1 # simply odd or even time for start of window
-
-  if (n==0):
-    fft_time_offset = -time
-    avg_time_offset = -time
-  n = n + 1
-
-  if (is_avg):
-    if (time < last_avg_time):
-      avg_time_offset += (1<<time_bits)
-      # print ("Average window time overflow: %d -> %d" % (last_avg_time, time))
-    last_avg_time = time
-    # Average sample times always have fft_size_log bits tail zero
-    fixed_avg_time = ((time & (time_mask-1)) + avg_time_offset) * ts
-    print ("% -10d    Average                % 10d  % 10d      % 10d" % (n, index, fixed_avg_time, avg_magnitude))
-    # print ("% -10d    Average                % 10d  % 10d      % 10d" % (n, index, time, avg_magnitude))
+fft_size_log2     = 11
+max_fft_size_log2 = 11
 
-  else:
-    if (time < last_fft_time):
-      fft_time_offset += (1<<time_bits)
-      # print ("FFT window time overflow: %d -> %d" % (last_fft_time, time))
-    last_fft_time = time
-    fixed_fft_time = (time + fft_time_offset) * ts
-    print ("% -10d    FFT sample % 10d  % 10d  % 10d  % 10d  % 10d (power=% 10d)" % (n, fft_no, index, fixed_fft_time, real, imag, (real*real)+(imag*imag)))
-    # print ("% -10d    FFT sample % 10d  %10d  % 10d  % 10d  % 10d" % (n, fft_no, index, time, real, imag))
+# One template per record class, bound once at module level rather
+# than rebuilt inside the loop
+AVG_FMT  = "% -10d    Average                % 10d  % 10d      % 10d"
+SAMP_FMT = "% -10d    FFT sample % 10d  % 10d  % 10d  % 10d  % 10d (power=% 10d)"
+
+# The loop lives in a function so the names it touches per record are
+# fast locals instead of module globals
+def main():
+  print ("#%-9s | %9s | %9s | %9s | %9s | %9s | %9s" % ("Sample", "Type", "FFT_No", "Index", "Time(ns)", "Real", "Imag"))
+
+  # The decode state machine lives in SparSDRUtil; this script only
+  # formats the record-order arrays it returns. The N210 runs a 100 MHz
+  # clock (10 ns ticks) and puts the header in the low word of a record.
+  data = stdin.buffer.read()
+  is_avg, index, fixed_time, avg_magnitude, fft_no, real, imag = decodeV1Records(data, fft_size_log2, max_fft_size_log2=max_fft_size_log2, tick_ns=10, hdr_first=True)
+
+  # Each record class is formatted in bulk over its own partition, with
+  # no per-record branch, then scattered back into record order
+  n      = np.arange(1, is_avg.shape[0]+1)
+  is_fft = ~is_avg
+
+  out = np.empty(is_avg.shape[0], dtype=object)
+  out[is_avg] = [AVG_FMT % row for row in zip(n[is_avg].tolist(), index[is_avg].tolist(), fixed_time[is_avg].tolist(), avg_magnitude[is_avg].tolist())]
+
+  re    = real[is_fft].astype(np.int64)
+  im    = imag[is_fft].astype(np.int64)
+  power = (re*re)+(im*im)
+  out[is_fft] = [SAMP_FMT % row for row in zip(n[is_fft].tolist(), fft_no[is_fft].tolist(), index[is_fft].tolist(), fixed_time[is_fft].tolist(), re.tolist(), im.tolist(), power.tolist())]
+
+  if out.size:
+    stdout.write("\n".join(out.tolist()))
+    stdout.write("\n")
+
+if __name__ == "__main__":
+  main()